@@ -137,7 +137,7 @@ ind = utils.model_builder.get_indices_block(
     np.r_[-20, -20, -10],
     np.r_[20, 20, 25],
     mesh.gridCC,
-)[0]
+)
 
 # Assign magnetization values
 model[ind, :] = np.kron(np.ones((ind.shape[0], 1)), M_xyz * 0.05)
@@ -0,0 +1,201 @@
+"""
+Functions for evaluating time-domain waveforms at a single time.
+
+These are called by the ``eval`` methods of the waveform classes when they
+receive a scalar time, which is how the time-stepping loops of the TDEM
+simulations use them. They work on Python floats only: a call costs well under
+a microsecond, so compiling them with Numba does not pay off against its
+dispatch overhead.
+"""
+
+import math
+
+
+def _step_off_eval(time, off_time, epsilon):
+    """
+    Evaluate a step-off waveform at a single time.
+
+    Parameters
+    ----------
+    time : float
+        Time at which the waveform is evaluated.
+    off_time : float
+        Time at which the transmitter is turned off.
+    epsilon : float
+        Small time window within which the transmitter is considered on.
+
+    Returns
+    -------
+    float
+    """
+    if abs(time) < epsilon or (time - off_time) < epsilon:
+        return 1.0
+    return 0.0
+
+
+def _ramp_off_eval(time, off_time, epsilon):
+    """
+    Evaluate a linear ramp-off waveform at a single time.
+
+    Parameters
+    ----------
+    time : float
+        Time at which the waveform is evaluated.
+    off_time : float
+        Time at which the transmitter current reaches zero.
+    epsilon : float
+        Small time window within which the transmitter is considered on.
+
+    Returns
+    -------
+    float
+    """
+    if abs(time) < epsilon:
+        return 1.0
+    elif time < off_time:
+        return -1.0 / off_time * (time - off_time)
+    return 0.0
+
+
+def _vtem_eval(time, peak_time, off_time, ramp_on_scale, inv_denom, inv_off_minus_peak):
+    """
+    Evaluate a VTEM waveform at a single time.
+
+    Parameters
+    ----------
+    time : float
+        Time at which the waveform is evaluated.
+    peak_time : float
+        Time at which the waveform reaches its peak.
+    off_time : float
+        Time at which the transmitter current reaches zero.
+    ramp_on_scale : float
+        Exponent scale of the ramp-on, ``ramp_on_rate / peak_time``.
+    inv_denom : float
+        Reciprocal of the ramp-on normalization, ``1 / (1 - exp(-ramp_on_rate))``.
+    inv_off_minus_peak : float
+        Reciprocal of the ramp-off duration, ``1 / (off_time - peak_time)``.
+
+    Returns
+    -------
+    float
+    """
+    if time <= peak_time:
+        return -math.expm1(-ramp_on_scale * time) * inv_denom
+    elif time < off_time:
+        return -inv_off_minus_peak * (time - off_time)
+    return 0.0
+
+
+def _trapezoid_eval(
+    time,
+    ramp_on_start,
+    ramp_on_end,
+    ramp_off_start,
+    ramp_off_end,
+    inv_ramp_on_len,
+    inv_ramp_off_len,
+):
+    """
+    Evaluate a trapezoidal waveform at a single time.
+
+    Parameters
+    ----------
+    time : float
+        Time at which the waveform is evaluated.
+    ramp_on_start, ramp_on_end : float
+        Start and end times of the linear ramp-on.
+    ramp_off_start, ramp_off_end : float
+        Start and end times of the linear ramp-off.
+    inv_ramp_on_len, inv_ramp_off_len : float
+        Reciprocals of the ramp-on and ramp-off durations.
+
+    Returns
+    -------
+    float
+    """
+    if time < ramp_on_start:
+        return 0.0
+    elif time <= ramp_on_end:
+        return (time - ramp_on_start) * inv_ramp_on_len
+    elif time < ramp_off_start:
+        return 1.0
+    elif time <= ramp_off_end:
+        return 1.0 - (time - ramp_off_start) * inv_ramp_off_len
+    return 0.0
+
+
+def _quarter_sine_ramp_on_eval(
+    time,
+    ramp_on_start,
+    ramp_on_end,
+    ramp_off_start,
+    ramp_off_end,
+    inv_ramp_on_len,
+    inv_ramp_off_len,
+):
+    """
+    Evaluate a quarter-sine ramp-on, linear ramp-off waveform at a single time.
+
+    Parameters
+    ----------
+    time : float
+        Time at which the waveform is evaluated.
+    ramp_on_start, ramp_on_end : float
+        Start and end times of the quarter-sine ramp-on.
+    ramp_off_start, ramp_off_end : float
+        Start and end times of the linear ramp-off.
+    inv_ramp_on_len, inv_ramp_off_len : float
+        Reciprocals of the ramp-on and ramp-off durations.
+
+    Returns
+    -------
+    float
+    """
+    if time < ramp_on_start:
+        return 0.0
+    elif time <= ramp_on_end:
+        return math.sin(0.5 * math.pi * inv_ramp_on_len * (time - ramp_on_start))
+    elif time < ramp_off_start:
+        return 1.0
+    elif time <= ramp_off_end:
+        return 1.0 - (time - ramp_off_start) * inv_ramp_off_len
+    return 0.0
+
+
+def _half_sine_eval(
+    time,
+    ramp_on_start,
+    ramp_on_end,
+    ramp_off_start,
+    ramp_off_end,
+    inv_ramp_on_len,
+    inv_ramp_off_len,
+):
+    """
+    Evaluate a quarter-sine ramp-on, quarter-cosine ramp-off waveform at a single time.
+
+    Parameters
+    ----------
+    time : float
+        Time at which the waveform is evaluated.
+    ramp_on_start, ramp_on_end : float
+        Start and end times of the quarter-sine ramp-on.
+    ramp_off_start, ramp_off_end : float
+        Start and end times of the quarter-cosine ramp-off.
+    inv_ramp_on_len, inv_ramp_off_len : float
+        Reciprocals of the ramp-on and ramp-off durations.
+
+    Returns
+    -------
+    float
+    """
+    if time < ramp_on_start:
+        return 0.0
+    elif time <= ramp_on_end:
+        return math.sin(0.5 * math.pi * inv_ramp_on_len * (time - ramp_on_start))
+    elif time < ramp_off_start:
+        return 1.0
+    elif time <= ramp_off_end:
+        return math.cos(0.5 * math.pi * inv_ramp_off_len * (time - ramp_off_start))
+    return 0.0
@@ -1,4 +1,7 @@
+import math
 import warnings
+import weakref
+from functools import cached_property
 
 import numpy as np
 from geoana.em.static import CircularLoopWholeSpace, MagneticDipoleWholeSpace
@@ -18,6 +21,14 @@ from ...utils.code_utils import (
 )
 from ..base import BaseEMSrc
 from ..utils import line_through_faces, segmented_line_current_source_term
+from ._waveform_functions import (
+    _half_sine_eval,
+    _quarter_sine_ramp_on_eval,
+    _ramp_off_eval,
+    _step_off_eval,
+    _trapezoid_eval,
+    _vtem_eval,
+)
 
 ###############################################################################
 #                                                                             #
@@ -26,6 +37,12 @@ from ..utils import line_through_faces, segmented_line_current_source_term
 ###############################################################################
 
 
+def _inverse_length(interval):
+    # reciprocal of the length of a (start, end) interval, zero if it is empty
+    length = interval[1] - interval[0]
+    return 1.0 / length if length > 0 else 0.0
+
+
 class BaseWaveform:
     """
     Base class for creating a waveform for time-domain EM simulations.
@@ -110,16 +127,16 @@ class BaseWaveform:
         self._epsilon = validate_float("epsilon", value, min_val=0)
 
     def eval(self, time):  # noqa: A003
-        """Evaluate current waveform at a given time
+        """Evaluate current waveform at given times
 
         Parameters
         ----------
-        time : float
-            A time
+        time : float or numpy.ndarray
+            Time(s) to evaluate the waveform at.
 
         Returns
         -------
-        float
+        float or numpy.ndarray
             Source current at the time provided
         """
         raise NotImplementedError
@@ -169,10 +186,14 @@ class StepOffWaveform(BaseWaveform):
         super().__init__(off_time=off_time, has_initial_fields=True, **kwargs)
 
     def eval(self, time):  # noqa: A003
-        if (abs(time - 0.0) < self.epsilon) or ((time - self.off_time) < self.epsilon):
-            return 1.0
-        else:
-            return 0.0
+        if isinstance(time, float) or np.ndim(time) == 0:
+            return _step_off_eval(float(time), self.off_time, self.epsilon)
+
+        t = np.asarray(time, dtype=float)
+        out = np.zeros_like(t)
+
+        out[(np.abs(t) < self.epsilon) | ((t - self.off_time) < self.epsilon)] = 1.0
+        return out
 
 
 class RampOffWaveform(BaseWaveform):
@@ -202,12 +223,17 @@ class RampOffWaveform(BaseWaveform):
         super().__init__(off_time=off_time, has_initial_fields=True, **kwargs)
 
     def eval(self, time):  # noqa: A003
-        if abs(time - 0.0) < self.epsilon:
-            return 1.0
-        elif time < self.off_time:
-            return -1.0 / self.off_time * (time - self.off_time)
-        else:
-            return 0.0
+        if isinstance(time, float) or np.ndim(time) == 0:
+            return _ramp_off_eval(float(time), self.off_time, self.epsilon)
+
+        t = np.asarray(time, dtype=float)
+        out = np.zeros_like(t)
+
+        p_0 = np.abs(t) < self.epsilon
+        p_1 = (t < self.off_time) & (~p_0)
+        out[p_0] = 1.0
+        out[p_1] = -1.0 / self.off_time * (t[p_1] - self.off_time)
+        return out
 
     def eval_deriv(self, time):
         t = np.asarray(time, dtype=float)
@@ -287,7 +313,13 @@ class RawWaveform(BaseWaveform):
         self._waveform_function = validate_callable("waveform_function", value)
 
     def eval(self, time):  # noqa: A003
-        return self.waveform_function(time)
+        if isinstance(time, float) or np.ndim(time) == 0:
+            return self.waveform_function(time)
+
+        # the waveform function is only required to accept a single time
+        t = np.asarray(time, dtype=float)
+        out = np.array([self.waveform_function(ti) for ti in t.ravel()], dtype=float)
+        return out.reshape(t.shape)
 
 
 class VTEMWaveform(BaseWaveform):
@@ -326,6 +358,13 @@ class VTEMWaveform(BaseWaveform):
         self.ramp_on_rate = ramp_on_rate
         self.peak_time = peak_time
 
+    @BaseWaveform.off_time.setter
+    def off_time(self, value):
+        BaseWaveform.off_time.fset(self, value)
+        if getattr(self, "_peak_time", None) is not None:
+            self._update_ramp_off_slope()
+        self._eval_args = None
+
     @property
     def peak_time(self):
         """Peak time
@@ -341,6 +380,23 @@ class VTEMWaveform(BaseWaveform):
     def peak_time(self, value):
         value = validate_float("peak_time", value, max_val=self.off_time)
         self._peak_time = value
+        self._update_ramp_off_slope()
+        self._update_ramp_on_scale()
+        self._eval_args = None
+
+    def _update_ramp_on_scale(self):
+        # exponent scale ramp_on_rate / peak_time of the ramp-on
+        if self._peak_time > 0:
+            self._ramp_on_scale = self._ramp_on_rate / self._peak_time
+        else:
+            self._ramp_on_scale = math.inf
+
+    def _update_ramp_off_slope(self):
+        # reciprocal of the ramp-off duration, only used when off_time > peak_time
+        if self._off_time > self._peak_time:
+            self._inv_off_minus_peak = 1.0 / (self._off_time - self._peak_time)
+        else:
+            self._inv_off_minus_peak = 0.0
 
     @property
     def ramp_on_rate(self):
@@ -359,16 +415,34 @@ class VTEMWaveform(BaseWaveform):
     def ramp_on_rate(self, value):
         value = validate_float("ramp_on_rate", value, min_val=0.0, inclusive_min=False)
         self._ramp_on_rate = value
+        # reciprocal of the normalization 1 - exp(-ramp_on_rate) of the ramp-on
+        self._inv_denom_exp = -1.0 / math.expm1(-value)
+        if getattr(self, "_peak_time", None) is not None:
+            self._update_ramp_on_scale()
+        self._eval_args = None
 
     def eval(self, time):  # noqa: A003
-        if time <= self.peak_time:
-            return (1.0 - np.exp(-self.ramp_on_rate * time / self.peak_time)) / (
-                1.0 - np.exp(-self.ramp_on_rate)
-            )
-        elif (time < self.off_time) and (time > self.peak_time):
-            return -1.0 / (self.off_time - self.peak_time) * (time - self.off_time)
-        else:
-            return 0.0
+        if isinstance(time, float) or np.ndim(time) == 0:
+            if self._eval_args is None:
+                # kernel arguments, rebuilt after a parameter is set
+                self._eval_args = (
+                    self._peak_time,
+                    self._off_time,
+                    self._ramp_on_scale,
+                    self._inv_denom_exp,
+                    self._inv_off_minus_peak,
+                )
+            return _vtem_eval(float(time), *self._eval_args)
+
+        t = np.asarray(time, dtype=float)
+        out = np.zeros_like(t)
+
+        p_1 = t <= self.peak_time
+        out[p_1] = -np.expm1(-self._ramp_on_scale * t[p_1]) * self._inv_denom_exp
+
+        p_2 = (t > self.peak_time) & (t < self.off_time)
+        out[p_2] = -self._inv_off_minus_peak * (t[p_2] - self.off_time)
+        return out
 
     def eval_deriv(self, time):
         t = np.asarray(time, dtype=float)
@@ -376,14 +450,13 @@ class VTEMWaveform(BaseWaveform):
 
         p_1 = (t <= self.peak_time) & (t >= 0.0)
         out[p_1] = (
-            self.ramp_on_rate
-            / self.peak_time
-            * np.exp(-self.ramp_on_rate * t[p_1] / self.peak_time)
-            / (1.0 - np.exp(-self.ramp_on_rate))
+            self._ramp_on_scale
+            * np.exp(-self._ramp_on_scale * t[p_1])
+            * self._inv_denom_exp
         )
 
         p_2 = (t > self.peak_time) & (t < self.off_time)
-        out[p_2] = -1.0 / (self.off_time - self.peak_time)
+        out[p_2] = -self._inv_off_minus_peak
 
         if out.ndim == 0:
             out = out.item()
@@ -446,6 +519,8 @@ class TrapezoidWaveform(BaseWaveform):
         self._ramp_on = validate_ndarray_with_shape(
             "ramp_on", value, shape=(2,), dtype=float
         )
+        self._inv_ramp_on_len = _inverse_length(self._ramp_on)
+        self._eval_args = None
 
     @property
     def ramp_off(self):
@@ -466,22 +541,48 @@ class TrapezoidWaveform(BaseWaveform):
         self._ramp_off = validate_ndarray_with_shape(
             "ramp_off", value, shape=(2,), dtype=float
         )
+        self._inv_ramp_off_len = _inverse_length(self._ramp_off)
+        self._eval_args = None
+
+    def _scalar_eval_args(self):
+        # kernel arguments as python floats, rebuilt after a ramp is set
+        if self._eval_args is None:
+            self._eval_args = (
+                *self._ramp_on.tolist(),
+                *self._ramp_off.tolist(),
+                self._inv_ramp_on_len,
+                self._inv_ramp_off_len,
+            )
+        return self._eval_args
 
     def eval(self, time):  # noqa: A003
-        if time < self.ramp_on[0]:
-            return 0
-        elif time >= self.ramp_on[0] and time <= self.ramp_on[1]:
-            return (1.0 / (self.ramp_on[1] - self.ramp_on[0])) * (
-                time - self.ramp_on[0]
-            )
-        elif time > self.ramp_on[1] and time < self.ramp_off[0]:
-            return 1
-        elif time >= self.ramp_off[0] and time <= self.ramp_off[1]:
-            return 1 - (1.0 / (self.ramp_off[1] - self.ramp_off[0])) * (
-                time - self.ramp_off[0]
+        if isinstance(time, float) or np.ndim(time) == 0:
+            return _trapezoid_eval(float(time), *self._scalar_eval_args())
+
+        t = np.asarray(time, dtype=float)
+        (on_start, on_end), (off_start, off_end) = self._ramp_on, self._ramp_off
+        if on_start < on_end <= off_start < off_end:
+            # the waveform is piecewise linear between its nodes, so a single
+            # interpolation replaces the masked assignments below exactly
+            return np.interp(
+                t,
+                (on_start, on_end, off_start, off_end),
+                (0.0, 1.0, 1.0, 0.0),
+                left=0.0,
+                right=0.0,
             )
-        else:
-            return 0
+
+        out = np.zeros_like(t)
+
+        p_1 = (t >= self.ramp_on[0]) & (t <= self.ramp_on[1])
+        out[p_1] = self._inv_ramp_on_len * (t[p_1] - self.ramp_on[0])
+
+        p_2 = (t > self.ramp_on[1]) & (t < self.ramp_off[0])
+        out[p_2] = 1.0
+
+        p_3 = (t >= self.ramp_off[0]) & (t <= self.ramp_off[1]) & (~p_1)
+        out[p_3] = 1.0 - self._inv_ramp_off_len * (t[p_3] - self.ramp_off[0])
+        return out
 
     def eval_deriv(self, time):
         t = np.asarray(time, dtype=float)
@@ -567,8 +668,8 @@ class TriangularWaveform(TrapezoidWaveform):
     def peak_time(self, value):
         value = validate_float("peak_time", value, max_val=self.off_time)
         self._peak_time = value
-        self._ramp_on = np.r_[self._ramp_on[0], value]
-        self._ramp_off = np.r_[value, self._ramp_off[1]]
+        self.ramp_on = np.r_[self._ramp_on[0], value]
+        self.ramp_off = np.r_[value, self._ramp_off[1]]
 
 
 class QuarterSineRampOnWaveform(TrapezoidWaveform):
@@ -600,23 +701,23 @@ class QuarterSineRampOnWaveform(TrapezoidWaveform):
         super().__init__(ramp_on=ramp_on, ramp_off=ramp_off, **kwargs)
 
     def eval(self, time):  # noqa: A003
-        if time < self.ramp_on[0]:
-            return 0
-        elif time >= self.ramp_on[0] and time <= self.ramp_on[1]:
-            return np.sin(
-                np.pi
-                / 2
-                * (1.0 / (self.ramp_on[1] - self.ramp_on[0]))
-                * (time - self.ramp_on[0])
-            )
-        elif time > self.ramp_on[1] and time < self.ramp_off[0]:
-            return 1
-        elif time >= self.ramp_off[0] and time <= self.ramp_off[1]:
-            return 1 - (1.0 / (self.ramp_off[1] - self.ramp_off[0])) * (
-                time - self.ramp_off[0]
-            )
-        else:
-            return 0
+        if isinstance(time, float) or np.ndim(time) == 0:
+            return _quarter_sine_ramp_on_eval(float(time), *self._scalar_eval_args())
+
+        t = np.asarray(time, dtype=float)
+        out = np.zeros_like(t)
+
+        p_1 = (t >= self.ramp_on[0]) & (t <= self.ramp_on[1])
+        out[p_1] = np.sin(
+            (0.5 * np.pi * self._inv_ramp_on_len) * (t[p_1] - self.ramp_on[0])
+        )
+
+        p_2 = (t > self.ramp_on[1]) & (t < self.ramp_off[0])
+        out[p_2] = 1.0
+
+        p_3 = (t >= self.ramp_off[0]) & (t <= self.ramp_off[1]) & (~p_1)
+        out[p_3] = 1.0 - self._inv_ramp_off_len * (t[p_3] - self.ramp_off[0])
+        return out
 
     def eval_deriv(self, time):
         t = np.asarray(time, dtype=float)
@@ -663,22 +764,25 @@ class HalfSineWaveform(TrapezoidWaveform):
         super().__init__(ramp_on=ramp_on, ramp_off=ramp_off, **kwargs)
 
     def eval(self, time):  # noqa: A003
-        if time < self.ramp_on[0]:
-            return 0
-        elif time >= self.ramp_on[0] and time <= self.ramp_on[1]:
-            return np.sin(
-                (np.pi / 2)
-                * ((time - self.ramp_on[0]) / (self.ramp_on[1] - self.ramp_on[0]))
-            )
-        elif time > self.ramp_on[1] and time < self.ramp_off[0]:
-            return 1
-        elif time >= self.ramp_off[0] and time <= self.ramp_off[1]:
-            return np.cos(
-                (np.pi / 2)
-                * ((time - self.ramp_off[0]) / (self.ramp_off[1] - self.ramp_off[0]))
-            )
-        else:
-            return 0
+        if isinstance(time, float) or np.ndim(time) == 0:
+            return _half_sine_eval(float(time), *self._scalar_eval_args())
+
+        t = np.asarray(time, dtype=float)
+        out = np.zeros_like(t)
+
+        p_1 = (t >= self.ramp_on[0]) & (t <= self.ramp_on[1])
+        out[p_1] = np.sin(
+            (0.5 * np.pi * self._inv_ramp_on_len) * (t[p_1] - self.ramp_on[0])
+        )
+
+        p_2 = (t > self.ramp_on[1]) & (t < self.ramp_off[0])
+        out[p_2] = 1.0
+
+        p_3 = (t >= self.ramp_off[0]) & (t <= self.ramp_off[1]) & (~p_1)
+        out[p_3] = np.cos(
+            (0.5 * np.pi * self._inv_ramp_off_len) * (t[p_3] - self.ramp_off[0])
+        )
+        return out
 
     def eval_deriv(self, time):
         t = np.asarray(time, dtype=float)
@@ -778,6 +882,9 @@ class PiecewiseLinearWaveform(BaseWaveform):
     def eval(self, time):  # noqa: A003
         times = self.times
         currents = self.currents
+        if not (isinstance(time, float) or np.ndim(time) == 0):
+            return np.interp(np.asarray(time, dtype=float), times, currents)
+
         if time <= times[0]:
             return currents[0]
         elif time >= times[-1]:
@@ -908,6 +1015,21 @@ class ExponentialWaveform(BaseWaveform):
         self._ramp_on_tau = value
 
     def eval(self, time):  # noqa: A003
+        if not (isinstance(time, float) or np.ndim(time) == 0):
+            t = np.asarray(time, dtype=float)
+            out = np.zeros_like(t)
+
+            p_1 = (t > self.start_time) & (t <= self.peak_time)
+            out[p_1] = (
+                1.0 - np.exp(-(t[p_1] - self.start_time) / self.ramp_on_tau)
+            ) / (1.0 - np.exp(-(self.peak_time - self.start_time) / self.ramp_on_tau))
+
+            p_2 = (t > self.peak_time) & (t < self.off_time)
+            out[p_2] = (
+                -1.0 / (self.off_time - self.peak_time) * (t[p_2] - self.off_time)
+            )
+            return out
+
         if time <= self.start_time:
             return 0.0
         elif time <= self.peak_time:
@@ -974,6 +1096,12 @@ class BaseTDEMSrc(BaseEMSrc):
     ):
         if waveform is None:
             waveform = StepOffWaveform()
+        # simulation-dependent quantities that do not change with time, held
+        # only as long as the simulation they were computed for is alive
+        self._cache = weakref.WeakKeyDictionary()
+        # factorizations only depend on the simulation, so they outlive changes
+        # to the source parameters
+        self._solver_cache = weakref.WeakKeyDictionary()
         super(BaseTDEMSrc, self).__init__(
             receiver_list=receiver_list, location=location, **kwargs
         )
@@ -1012,6 +1140,43 @@ class BaseTDEMSrc(BaseEMSrc):
     def srcType(self, var):
         self._srcType = validate_string("srcType", var, ["inductive", "galvanic"])
 
+    def __getstate__(self):
+        # the weak-key caches cannot be pickled, and are rebuilt on demand
+        state = self.__dict__.copy()
+        state.pop("_cache", None)
+        state.pop("_solver_cache", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache = weakref.WeakKeyDictionary()
+        self._solver_cache = weakref.WeakKeyDictionary()
+
+    def _simulation_cache(self, simulation):
+        # cached quantities belonging to a single simulation
+        cache = self._cache.get(simulation)
+        if cache is None:
+            cache = self._cache[simulation] = {}
+        return cache
+
+    def _cached_solver(self, simulation, name, matrix, get_A):
+        # factorization reused until the simulation rebuilds ``matrix``, and
+        # cleaned up once it is replaced or its simulation is collected
+        cache = self._solver_cache.get(simulation)
+        if cache is None:
+            cache = self._solver_cache[simulation] = {}
+        cached = cache.get(name)
+        if cached is None or cached[0] is not matrix:
+            if cached is not None:
+                cached[2]()
+            Ainv = simulation.solver(get_A(simulation))
+            cached = cache[name] = (
+                matrix,
+                Ainv,
+                weakref.finalize(simulation, Ainv.clean),
+            )
+        return cached[1]
+
     def bInitial(self, simulation):
         """Return initial B-field (``Zero`` for ``BaseTDEMSrc`` class)
 
@@ -1183,6 +1348,7 @@ class MagDipole(BaseTDEMSrc):
     @location.setter
     def location(self, vec):
         self._location = validate_location_property("location", vec, dim=3)
+        self._reset_cache()
 
     @property
     def moment(self):
@@ -1199,6 +1365,7 @@ class MagDipole(BaseTDEMSrc):
     def moment(self, value):
         value = validate_float("moment", value, min_val=0, inclusive_min=False)
         self._moment = value
+        self._reset_cache()
 
     @property
     def orientation(self):
@@ -1214,6 +1381,7 @@ class MagDipole(BaseTDEMSrc):
     @orientation.setter
     def orientation(self, var):
         self._orientation = validate_direction("orientation", var, dim=3)
+        self._reset_cache()
 
     @property
     def mu(self):
@@ -1230,20 +1398,33 @@ class MagDipole(BaseTDEMSrc):
     def mu(self, value):
         value = validate_float("mu", value, min_val=mu_0)
         self._mu = value
+        self._reset_cache()
+
+    def _reset_cache(self):
+        # drop everything derived from the source parameters
+        self._cache = weakref.WeakKeyDictionary()
+        self._hp = self._MfMuip = self._MfMuipI = None
+        self.__dict__.pop("_dipole", None)
+
+    @cached_property
+    def _dipole(self):
+        return MagneticDipoleWholeSpace(
+            mu=self._mu,
+            orientation=self._orientation,
+            location=self._location,
+            moment=self._moment,
+        )
 
     def _srcFct(self, obsLoc, coordinates="cartesian"):
-        if getattr(self, "_dipole", None) is None:
-            self._dipole = MagneticDipoleWholeSpace(
-                mu=self.mu,
-                orientation=self.orientation,
-                location=self.location,
-                moment=self.moment,
-            )
         out = self._dipole.vector_potential(obsLoc, coordinates=coordinates)
         out[np.isnan(out)] = 0
         return out
 
     def _aSrc(self, simulation):
+        cache = self._simulation_cache(simulation)
+        if "aSrc" in cache:
+            return cache["aSrc"]
+
         coordinates = "cartesian"
         if simulation._formulation == "EB":
             gridX = simulation.mesh.gridEx
@@ -1257,23 +1438,35 @@ class MagDipole(BaseTDEMSrc):
 
         if simulation.mesh._meshType == "CYL":
             coordinates = "cylindrical"
-            if simulation.mesh.is_symmetric:
-                return self._srcFct(gridY)[:, 1]
-
-        ax = self._srcFct(gridX, coordinates)[:, 0]
-        ay = self._srcFct(gridY, coordinates)[:, 1]
-        az = self._srcFct(gridZ, coordinates)[:, 2]
-        a = np.concatenate((ax, ay, az))
 
+        if simulation.mesh._meshType == "CYL" and simulation.mesh.is_symmetric:
+            a = self._srcFct(gridY)[:, 1]
+        else:
+            # evaluate all three staggered grids in a single call
+            nx, ny = gridX.shape[0], gridY.shape[0]
+            A = self._srcFct(np.vstack((gridX, gridY, gridZ)), coordinates)
+            a = np.empty(A.shape[0])
+            a[:nx] = A[:nx, 0]
+            a[nx : nx + ny] = A[nx : nx + ny, 1]
+            a[nx + ny :] = A[nx + ny :, 2]
+
+        cache["aSrc"] = a
         return a
 
     def _getAmagnetostatic(self, simulation):
         if simulation._formulation == "EB":
-            return (
-                simulation.mesh.face_divergence
-                * simulation.MfMuiI
-                * simulation.mesh.face_divergence.T.tocsr()
-            )
+            # MfMuiI is rebuilt by the simulation when its permeability changes
+            cache = self._simulation_cache(simulation)
+            MfMuiI = simulation.MfMuiI
+            cached = cache.get("Amagnetostatic")
+            if cached is None or cached[0] is not MfMuiI:
+                A = (
+                    simulation.mesh.face_divergence
+                    * MfMuiI
+                    * simulation.mesh.face_divergence.T.tocsr()
+                )
+                cached = cache["Amagnetostatic"] = (MfMuiI, A)
+            return cached[1]
         else:
             raise NotImplementedError(
                 "Solving the magnetostatic simulationlem for the initial fields "
@@ -1311,22 +1504,51 @@ class MagDipole(BaseTDEMSrc):
                 "See: https://github.com/simpeg/simpeg/issues/680"
             )
 
+    def _getAmagnetostaticinv(self, simulation):
+        return self._cached_solver(
+            simulation,
+            "Amagnetostaticinv",
+            simulation.MfMuiI,
+            self._getAmagnetostatic,
+        )
+
     def _phiSrc(self, simulation):
-        Ainv = simulation.solver(
-            self._getAmagnetostatic(simulation)
-        )  # todo: store these
-        rhs = self._rhs_magnetostatic(simulation)
-        Ainv.clean()
-        return Ainv * rhs
+        cache = self._simulation_cache(simulation)
+        MfMuiI = simulation.MfMuiI
+        cached = cache.get("phiSrc")
+        if cached is None or cached[0] is not MfMuiI:
+            Ainv = self._getAmagnetostaticinv(simulation)
+            rhs = self._rhs_magnetostatic(simulation)
+            cached = cache["phiSrc"] = (MfMuiI, Ainv * rhs)
+        return cached[1]
 
     def _bSrc(self, simulation):
-        if simulation._formulation == "EB":
+        cache = self._simulation_cache(simulation)
+        if "bSrc" not in cache:
+            if simulation._formulation == "EB":
+                C = simulation.mesh.edge_curl
+
+            elif simulation._formulation == "HJ":
+                C = simulation.mesh.edge_curl.T
+
+            cache["bSrc"] = C * self._aSrc(simulation)
+        return cache["bSrc"]
+
+    def _s_eSrc(self, simulation):
+        # time-independent part of the electric source term
+        cache = self._simulation_cache(simulation)
+        if "s_eSrc" not in cache:
             C = simulation.mesh.edge_curl
+            b = self._bSrc(simulation)
 
-        elif simulation._formulation == "HJ":
-            C = simulation.mesh.edge_curl.T
+            if simulation._formulation == "EB":
+                MfMui = simulation.mesh.get_face_inner_product(1.0 / self.mu)
+                cache["s_eSrc"] = C.T * (MfMui * b)
 
-        return C * self._aSrc(simulation)
+            elif simulation._formulation == "HJ":
+                h = 1.0 / self.mu * b
+                cache["s_eSrc"] = C * h
+        return cache["s_eSrc"]
 
     def bInitial(self, simulation):
         """Compute initial magnetic flux density.
@@ -1349,7 +1571,7 @@ class MagDipole(BaseTDEMSrc):
             return Zero()
 
         if np.all(simulation.mu == self.mu):
-            return self._bSrc(simulation)
+            return self._bSrc(simulation).copy()
 
         else:
             if simulation._formulation == "EB":
@@ -1399,8 +1621,6 @@ class MagDipole(BaseTDEMSrc):
         numpy.ndarray
             magnetic source term on mesh.
         """
-        if self.waveform.has_initial_fields is False:
-            return Zero()
         return Zero()
 
     def s_e(self, simulation, time):
@@ -1415,33 +1635,47 @@ class MagDipole(BaseTDEMSrc):
 
         Returns
         -------
-        numpy.ndarray
-            Electric source term on mesh.
+        numpy.ndarray or Zero
+            Electric source term on mesh. Returns :class:`Zero` when the
+            waveform is zero at the time provided.
         """
-        C = simulation.mesh.edge_curl
-        b = self._bSrc(simulation)
+        # read the already validated waveform once, this is called every time step
+        waveform = self._waveform
+        if waveform.has_initial_fields is True and time < simulation.time_steps[1]:
+            return self._s_eSrc(simulation).copy()
+
+        # skip the source term entirely while the transmitter is off
+        w = waveform.eval(time)
+        if w == 0.0:
+            return Zero()
+        return self._s_eSrc(simulation) * w
 
-        if simulation._formulation == "EB":
-            MfMui = simulation.mesh.get_face_inner_product(1.0 / self.mu)
+    def s_e_batch(self, simulation, times):
+        """Electric source terms (s_e) at several times
 
-            if (
-                self.waveform.has_initial_fields is True
-                and time < simulation.time_steps[1]
-            ):
-                return C.T * (MfMui * b)
-            else:
-                return C.T * (MfMui * b) * self.waveform.eval(time)
+        The time-independent part of the source term is computed once and
+        scaled by the waveform evaluated at all of the times.
 
-        elif simulation._formulation == "HJ":
-            h = 1.0 / self.mu * b
+        Parameters
+        ----------
+        simulation : BaseTDEMSimulation
+            SimPEG TDEM simulation
+        times : (n_times) array_like of float
+            Evaluation times
 
-            if (
-                self.waveform.has_initial_fields is True
-                and time < simulation.time_steps[1]
-            ):
-                return C * h
-            else:
-                return C * h * self.waveform.eval(time)
+        Returns
+        -------
+        (n_edges, n_times) numpy.ndarray
+            Electric source terms on mesh, one column per time. For the HJ
+            formulation there is one row per face instead.
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        waveform = self._waveform
+        w = np.atleast_1d(waveform.eval(times))
+        if waveform.has_initial_fields is True:
+            # matches s_e, which uses the unscaled initial source term
+            w[times < simulation.time_steps[1]] = 1.0
+        return np.multiply.outer(self._s_eSrc(simulation), w)
 
 
 class CircularLoop(MagDipole):
@@ -1522,6 +1756,7 @@ class CircularLoop(MagDipole):
     def radius(self, rad):
         rad = validate_float("radius", rad, min_val=0, inclusive_min=False)
         self._radius = rad
+        self._reset_cache()
 
     @property
     def current(self):
@@ -1540,6 +1775,7 @@ class CircularLoop(MagDipole):
         if np.abs(I) == 0.0:
             raise ValueError("current must be non-zero.")
         self._current = I
+        self._reset_cache()
 
     @property
     def moment(self):
@@ -1577,20 +1813,27 @@ class CircularLoop(MagDipole):
     @n_turns.setter
     def n_turns(self, value):
         self._n_turns = validate_integer("n_turns", value, min_val=1)
+        self._reset_cache()
+
+    def _reset_cache(self):
+        super()._reset_cache()
+        self.__dict__.pop("_loop", None)
+
+    @cached_property
+    def _loop(self):
+        return CircularLoopWholeSpace(
+            mu=self.mu,
+            location=self.location,
+            orientation=self.orientation,
+            radius=self.radius,
+            current=self.current,
+        )
 
     def _srcFct(self, obsLoc, coordinates="cartesian"):
         # return MagneticLoopVectorPotential(
         #     self.location, obsLoc, component, mu=self.mu, radius=self.radius
         # )
 
-        if getattr(self, "_loop", None) is None:
-            self._loop = CircularLoopWholeSpace(
-                mu=self.mu,
-                location=self.location,
-                orientation=self.orientation,
-                radius=self.radius,
-                current=self.current,
-            )
         out = self._loop.vector_potential(obsLoc, coordinates)
         out[np.isnan(out)] = 0
         return self.n_turns * out
@@ -1661,6 +1904,8 @@ class LineCurrent(BaseTDEMSrc):
         else:
             self._srcType = "galvanic"
         self._location = loc
+        self._Mejs = self._Mfjs = None
+        self._Mejs_scaled = self._Mfjs_scaled = None
 
     @property
     def current(self):
@@ -1679,6 +1924,7 @@ class LineCurrent(BaseTDEMSrc):
         if np.abs(I) == 0.0:
             raise ValueError("current must be non-zero.")
         self._current = I
+        self._Mejs_scaled = self._Mfjs_scaled = None
 
     @property
     def n_segments(self):
@@ -1710,6 +1956,12 @@ class LineCurrent(BaseTDEMSrc):
             )
         return self.current * self._Mejs
 
+    def _get_Mejs_scaled(self, simulation):
+        # source term on edges already scaled by the current
+        if self._Mejs_scaled is None:
+            self._Mejs_scaled = self.Mejs(simulation)
+        return self._Mejs_scaled
+
     def Mfjs(self, simulation):
         """Integrated electrical source term on faces
 
@@ -1729,6 +1981,12 @@ class LineCurrent(BaseTDEMSrc):
             )
         return self.current * self._Mfjs
 
+    def _get_Mfjs_scaled(self, simulation):
+        # source term on faces already scaled by the current
+        if self._Mfjs_scaled is None:
+            self._Mfjs_scaled = self.Mfjs(simulation)
+        return self._Mfjs_scaled
+
     def getRHSdc(self, simulation):
         """Right-hand side for galvanic source term
 
@@ -1922,16 +2180,19 @@ class LineCurrent(BaseTDEMSrc):
             * Div  # stabalizing term. See (Chen, Haber & Oldenburg 2002)
         )
 
+    def _getAmmrinv(self, simulation):
+        return self._cached_solver(
+            simulation, "Ammrinv", simulation.MeMuI, self._getAmmr
+        )
+
     def _aInitial(self, simulation):
-        A = self._getAmmr(simulation)
-        Ainv = simulation.solver(A)  # todo: store this
+        Ainv = self._getAmmrinv(simulation)
         s_e = self.s_e(simulation, 0)
         rhs = s_e + self.jInitial(simulation)
         return Ainv * rhs
 
     def _aInitialDeriv(self, simulation, v, adjoint=False):
-        A = self._getAmmr(simulation)
-        Ainv = simulation.solver(A)  # todo: store this - move it to the simulation
+        Ainv = self._getAmmrinv(simulation)
 
         if adjoint is True:
             return self.jInitialDeriv(
@@ -2056,13 +2317,18 @@ class LineCurrent(BaseTDEMSrc):
 
         Returns
         -------
-        numpy.ndarray
-            electric source term on mesh.
+        numpy.ndarray or Zero
+            electric source term on mesh. Returns :class:`Zero` when the
+            waveform is zero at the time provided.
         """
+        w = self.waveform.eval(time)
+        if w == 0.0:
+            return Zero()
+
         if simulation._formulation == "EB":
-            return self.Mejs(simulation) * self.waveform.eval(time)
+            return self._get_Mejs_scaled(simulation) * w
         elif simulation._formulation == "HJ":
-            return self.Mfjs(simulation) * self.waveform.eval(time)
+            return self._get_Mfjs_scaled(simulation) * w
 
 
 # TODO: this should be generalized and plugged into getting the Line current
@@ -2075,8 +2341,13 @@ class RawVec_Grounded(LineCurrent):
             receiver_list, srcType="galvanic", **kwargs
         )
 
-        if s_e is not None:
-            self._Mfjs = self._s_e = s_e
+        # kept apart from _Mfjs, which is rebuilt when the location changes
+        self._s_e = s_e
+
+    def Mfjs(self, simulation):
+        if self._s_e is None:
+            return super().Mfjs(simulation)
+        return self.current * self._s_e
 
     # def getRHSdc(self, simulation):
     #     return sdiag(simulation.mesh.cell_volumes) * simulation.mesh.face_divergence * self._s_e
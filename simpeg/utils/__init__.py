@@ -80,6 +80,7 @@ Model Utility Functions
   model_builder.add_block
   model_builder.create_2_layer_model
   model_builder.create_block_in_wholespace
+  model_builder.create_blocks_in_wholespace
   model_builder.create_ellipse_in_wholespace
   model_builder.create_from_function
   model_builder.create_layers_model
@@ -0,0 +1,149 @@
+"""
+Numba functions for the model builder utilities.
+
+Every kernel is compiled in a serial and a parallel version. The parallel
+versions only pay off for large numbers of points, so callers should go
+through :func:`_choose_kernel`.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    # Define dummy jit decorator
+    def jit(*args, **kwargs):
+        return lambda f: f
+
+    numba = None
+    prange = range
+else:
+    from numba import jit, prange
+
+
+def _points_in_block(points, lower, upper):
+    """
+    Flag the points that lie inside an axis aligned block
+
+    Parameters
+    ----------
+    points : (n_points, dim) numpy.ndarray
+        Point locations.
+    lower, upper : (dim) numpy.ndarray
+        Lower and upper corners of the block. Points on the boundary are
+        considered inside.
+
+    Returns
+    -------
+    (n_points) numpy.ndarray of bool
+        Whether each point lies inside the block.
+    """
+    n_points, dim = points.shape
+    inside = np.empty(n_points, dtype=np.bool_)
+    for i in prange(n_points):
+        # no early exit, so the loop stays free of branches
+        is_inside = True
+        for j in range(dim):
+            x = points[i, j]
+            is_inside &= (x >= lower[j]) & (x <= upper[j])
+        inside[i] = is_inside
+    return inside
+
+
+def _points_in_sphere(points, center, radius):
+    """
+    Flag the points that lie strictly inside a sphere
+
+    Parameters
+    ----------
+    points : (n_points, dim) numpy.ndarray
+        Point locations.
+    center : (dim) numpy.ndarray
+        Center of the sphere.
+    radius : float
+        Radius of the sphere.
+
+    Returns
+    -------
+    (n_points) numpy.ndarray of bool
+        Whether each point lies inside the sphere.
+    """
+    n_points, dim = points.shape
+    radius_squared = radius * radius
+    inside = np.empty(n_points, dtype=np.bool_)
+    for i in prange(n_points):
+        distance_squared = 0.0
+        for j in range(dim):
+            diff = points[i, j] - center[j]
+            distance_squared += diff * diff
+        inside[i] = distance_squared < radius_squared
+    return inside
+
+
+def _last_block_containing(points, lower, upper):
+    """
+    Find the last of several axis aligned blocks that contains each point
+
+    Parameters
+    ----------
+    points : (n_points, dim) numpy.ndarray
+        Point locations.
+    lower, upper : (n_blocks, dim) numpy.ndarray
+        Lower and upper corners of each block. Points on the boundary are
+        considered inside.
+
+    Returns
+    -------
+    (n_points) numpy.ndarray of int
+        Index of the last block containing each point, or -1 if no block
+        contains it.
+    """
+    n_points, dim = points.shape
+    n_blocks = lower.shape[0]
+    block_index = np.empty(n_points, dtype=np.int64)
+    for i in prange(n_points):
+        block_index[i] = -1
+        for k in range(n_blocks - 1, -1, -1):
+            is_inside = True
+            for j in range(dim):
+                x = points[i, j]
+                is_inside &= (x >= lower[k, j]) & (x <= upper[k, j])
+            if is_inside:
+                block_index[i] = k
+                break
+    return block_index
+
+
+# Below this many points starting the thread pool costs more than it saves
+_PARALLEL_MIN_POINTS = 200_000
+
+
+def _choose_kernel(serial, parallel, n_points):
+    """
+    Pick the serial or the parallel version of a kernel
+
+    Parameters
+    ----------
+    serial, parallel : callable
+        Serial and parallel versions of the same kernel.
+    n_points : int
+        Number of points the kernel will be evaluated on.
+
+    Returns
+    -------
+    callable
+    """
+    return parallel if n_points >= _PARALLEL_MIN_POINTS else serial
+
+
+# Define decorated versions of these functions
+_points_in_block_serial = jit(nopython=True, parallel=False)(_points_in_block)
+_points_in_block_parallel = jit(nopython=True, parallel=True)(_points_in_block)
+_points_in_sphere_serial = jit(nopython=True, parallel=False)(_points_in_sphere)
+_points_in_sphere_parallel = jit(nopython=True, parallel=True)(_points_in_sphere)
+_last_block_containing_serial = jit(nopython=True, parallel=False)(
+    _last_block_containing
+)
+_last_block_containing_parallel = jit(nopython=True, parallel=True)(
+    _last_block_containing
+)
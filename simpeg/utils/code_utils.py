@@ -910,22 +910,22 @@ def validate_float(
             f"{property_name!r} must be int or float, got {type(var)}"
         ) from err
 
-    value_range_string = f"{min_val}, {max_val}"
-    if inclusive_min:
-        value_range_string = "[" + value_range_string
-    else:
-        value_range_string = "(" + value_range_string
-    if inclusive_max:
-        value_range_string = value_range_string + "]"
-    else:
-        value_range_string = value_range_string + ")"
-
     if (
         (inclusive_min and var < min_val)
         or (not inclusive_min and var <= min_val)
         or (inclusive_max and var > max_val)
         or (not inclusive_max and var >= max_val)
     ):
+        # only build the message when it is needed, setters call this a lot
+        value_range_string = f"{min_val}, {max_val}"
+        if inclusive_min:
+            value_range_string = "[" + value_range_string
+        else:
+            value_range_string = "(" + value_range_string
+        if inclusive_max:
+            value_range_string = value_range_string + "]"
+        else:
+            value_range_string = value_range_string + ")"
         raise ValueError(
             f"{property_name!r} must be a value in the range " + value_range_string
         )
@@ -1119,15 +1119,6 @@ def validate_type(property_name, obj, obj_type, cast=True, strict=False):
     if not isinstance(obj_type, tuple):
         obj_type = (obj_type,)
 
-    if len(obj_type) > 1:
-        type_name = (
-            ", ".join(cls.__qualname__ for cls in obj_type[:-1])
-            + " or "
-            + obj_type[-1].__qualname__
-        )
-    else:
-        type_name = obj_type[0].__qualname__
-
     if cast:
         good_cast = False
         err = None
@@ -1142,20 +1133,33 @@ def validate_type(property_name, obj, obj_type, cast=True, strict=False):
                 break
         if not good_cast:
             raise TypeError(
-                f"{type(obj).__qualname__} cannot be converted to {type_name} "
+                f"{type(obj).__qualname__} cannot be converted to {_type_name(obj_type)} "
                 f"required for {property_name}."
             ) from err
     if strict and type(obj) not in obj_type:
         raise TypeError(
-            f"{property_name} must be exactly a {type_name}, not {type(obj).__qualname__}"
+            f"{property_name} must be exactly a {_type_name(obj_type)}, "
+            f"not {type(obj).__qualname__}"
         )
     if not isinstance(obj, obj_type):
         raise TypeError(
-            f"{property_name} must be an instance of {type_name}, not {type(obj).__qualname__}"
+            f"{property_name} must be an instance of {_type_name(obj_type)}, "
+            f"not {type(obj).__qualname__}"
         )
     return obj
 
 
+def _type_name(obj_type):
+    """Human readable name of a tuple of classes, used in error messages."""
+    if len(obj_type) > 1:
+        return (
+            ", ".join(cls.__qualname__ for cls in obj_type[:-1])
+            + " or "
+            + obj_type[-1].__qualname__
+        )
+    return obj_type[0].__qualname__
+
+
 def validate_callable(property_name, obj):
     """
     Validate if an object is callable
@@ -1,14 +1,35 @@
 import warnings
+from functools import lru_cache
 import numpy as np
 import scipy.ndimage as ndi
-import scipy.sparse as sp
 from .mat_utils import mkvc
+from ._numba_functions import (
+    numba,
+    _choose_kernel,
+    _last_block_containing_parallel,
+    _last_block_containing_serial,
+    _points_in_block_parallel,
+    _points_in_block_serial,
+    _points_in_sphere_parallel,
+    _points_in_sphere_serial,
+)
 from scipy.spatial import Delaunay
 from discretize.base import BaseMesh
 
 from ..typing import RandomSeed
 
 
+# Triangulations of small point sets are reused by get_indices_polygon. They
+# are keyed by the point coordinates, not by the array, so editing an array in
+# place can never return a stale triangulation.
+_MAX_CACHED_HULL_POINTS = 1024
+
+
+@lru_cache(maxsize=32)
+def _cached_delaunay(pts_bytes, shape):
+    return Delaunay(np.frombuffer(pts_bytes, dtype=float).reshape(shape))
+
+
 def add_block(cell_centers, model, p0, p1, prop_value):
     """Add a homogeneous block to an existing cell centered model
 
@@ -53,9 +74,18 @@ def get_indices_block(p0, p1, cell_centers):
 
     Returns
     -------
-    tuple of int
+    (n_inside) numpy.ndarray of int
         Indices of the cells whose center lie within the specified block
 
+    Notes
+    -----
+    .. versionchanged:: 0.24.0
+
+        The indices are returned as a flat array instead of the one-element
+        tuple returned by :func:`numpy.where`. Code that used
+        ``get_indices_block(...)[0]`` must drop the ``[0]``, which now selects
+        only the first cell inside the block.
+
     """
 
     if isinstance(cell_centers, BaseMesh):
@@ -68,48 +98,28 @@ def get_indices_block(p0, p1, cell_centers):
     dimMesh = np.size(cell_centers[0, :])
     assert len(p0) == dimMesh, "Dimension mismatch. len(p0) != dimMesh"
 
-    for ii in range(len(p0)):
-        p0[ii], p1[ii] = np.min([p0[ii], p1[ii]]), np.max([p0[ii], p1[ii]])
-
-    if dimMesh == 1:
-        # Define the reference points
-        x1 = p0[0]
-        x2 = p1[0]
-
-        indX = (x1 <= cell_centers[:, 0]) & (cell_centers[:, 0] <= x2)
-        ind = np.where(indX)
-
-    elif dimMesh == 2:
-        # Define the reference points
-        x1 = p0[0]
-        y1 = p0[1]
-
-        x2 = p1[0]
-        y2 = p1[1]
-
-        indX = (x1 <= cell_centers[:, 0]) & (cell_centers[:, 0] <= x2)
-        indY = (y1 <= cell_centers[:, 1]) & (cell_centers[:, 1] <= y2)
-
-        ind = np.where(indX & indY)
-
-    elif dimMesh == 3:
-        # Define the points
-        x1 = p0[0]
-        y1 = p0[1]
-        z1 = p0[2]
-
-        x2 = p1[0]
-        y2 = p1[1]
-        z2 = p1[2]
-
-        indX = (x1 <= cell_centers[:, 0]) & (cell_centers[:, 0] <= x2)
-        indY = (y1 <= cell_centers[:, 1]) & (cell_centers[:, 1] <= y2)
-        indZ = (z1 <= cell_centers[:, 2]) & (cell_centers[:, 2] <= z2)
-
-        ind = np.where(indX & indY & indZ)
+    # sort the corners without modifying the inputs
+    p0 = np.asarray(p0, dtype=float)
+    p1 = np.asarray(p1, dtype=float)
+    lower = np.minimum(p0, p1)
+    upper = np.maximum(p0, p1)
+    if numba is not None:
+        # single fused pass over the cell centers
+        points_in_block = _choose_kernel(
+            _points_in_block_serial, _points_in_block_parallel, len(cell_centers)
+        )
+        mask = points_in_block(
+            np.ascontiguousarray(cell_centers, dtype=float), lower, upper
+        )
+    else:
+        # accumulate the axis tests into a single mask over the cells
+        mask = cell_centers[:, 0] >= lower[0]
+        mask &= cell_centers[:, 0] <= upper[0]
+        for i in range(1, dimMesh):
+            mask &= cell_centers[:, i] >= lower[i]
+            mask &= cell_centers[:, i] <= upper[i]
 
-    # Return a tuple
-    return ind
+    return np.flatnonzero(mask)
 
 
 def create_block_in_wholespace(
@@ -153,6 +163,75 @@ def create_block_in_wholespace(
     return mkvc(sigma)
 
 
+def create_blocks_in_wholespace(
+    cell_centers, p0s, p1s, block_values, background_value=0.0
+):
+    """Construct cell-centered model comprised of several blocks in a wholespace.
+
+    All of the blocks are tested in a single sweep over the cells, which is
+    faster than adding the blocks one at a time with :func:`add_block`.
+
+    Parameters
+    ----------
+    cell_centers : (n_cells, dim) numpy.ndarray or discretize.base.BaseMesh
+        A mesh or its gridded cell center locations
+    p0s : (n_blocks, dim) numpy.ndarray
+        Bottom southwest corner of each block
+    p1s : (n_blocks, dim) numpy.ndarray
+        Top northeast corner of each block
+    block_values : (n_blocks) numpy.ndarray
+        Physical property value of each block. Where blocks overlap, the value
+        of the last block is used, as if the blocks were added in order.
+    background_value : float, optional
+        Background physical property value.
+
+    Returns
+    -------
+    (n_cells) numpy.ndarray
+        Physical property model defined at the cell centers
+    """
+
+    if isinstance(cell_centers, BaseMesh):
+        cell_centers = cell_centers.cell_centers
+
+    p0s = np.atleast_2d(np.asarray(p0s, dtype=float))
+    p1s = np.atleast_2d(np.asarray(p1s, dtype=float))
+    block_values = np.atleast_1d(np.asarray(block_values, dtype=float))
+    n_blocks, dim = p0s.shape
+    assert p1s.shape == p0s.shape, "Dimension mismatch. p0s.shape != p1s.shape"
+    assert dim == cell_centers.shape[1], "Dimension mismatch. p0s.shape[1] != dimMesh"
+    assert len(block_values) == n_blocks, "Need one value per block"
+
+    lower = np.minimum(p0s, p1s)
+    upper = np.maximum(p0s, p1s)
+
+    sigma = np.full(cell_centers.shape[0], background_value, dtype=float)
+    if numba is not None:
+        last_block_containing = _choose_kernel(
+            _last_block_containing_serial,
+            _last_block_containing_parallel,
+            len(cell_centers),
+        )
+        last = last_block_containing(
+            np.ascontiguousarray(cell_centers, dtype=float), lower, upper
+        )
+        inside = last >= 0
+        sigma[inside] = block_values[last[inside]]
+        return sigma
+
+    # keep the (chunk, n_blocks, dim) comparisons to about a megabyte
+    chunk_size = max(1, 2**20 // (n_blocks * dim))
+    for start in range(0, cell_centers.shape[0], chunk_size):
+        chunk = cell_centers[start : start + chunk_size, None, :]
+        hits = np.all((lower <= chunk) & (chunk <= upper), axis=2)
+        # index of the last block containing each cell
+        last = n_blocks - 1 - np.argmax(hits[:, ::-1], axis=1)
+        inside = hits.any(axis=1)
+        sigma[start : start + chunk_size][inside] = block_values[last[inside]]
+
+    return sigma
+
+
 def create_ellipse_in_wholespace(
     cell_centers, center=None, anisotropy=None, slope=10.0, theta=0.0
 ):
@@ -184,10 +263,7 @@ def create_ellipse_in_wholespace(
         center = [0, 0, 0]
     if anisotropy is None:
         anisotropy = [1, 1, 1]
-    G = cell_centers.copy()
     dim = cell_centers.shape[1]
-    for i in range(dim):
-        G[:, i] = G[:, i] - center[i]
 
     theta = -theta * np.pi / 180
     M = np.array(
@@ -198,12 +274,12 @@ def create_ellipse_in_wholespace(
         ]
     )
     M = M[:dim, :dim]
-    G = M.dot(G.T).T
 
-    for i in range(dim):
-        G[:, i] = G[:, i] / anisotropy[i] * 2.0
+    # shift, rotate and scale the cell centers in one pass
+    G = (cell_centers - np.asarray(center[:dim], dtype=float)) @ M.T
+    G *= 2.0 / np.asarray(anisotropy[:dim], dtype=float)
 
-    D = np.sqrt(np.sum(G**2, axis=1))
+    D = np.sqrt(np.einsum("ij,ij->i", G, G))
     return -np.arctan((D - 1) * slope) * (2.0 / np.pi) / 2.0 + 0.5
 
 
@@ -221,8 +297,9 @@ def get_indices_sphere(center, radius, cell_centers):
 
     Returns
     -------
-    tuple of int
-        Indices of the cells whose center lie within the specified sphere
+    (n_cells) numpy.ndarray of bool
+        Mask that is ``True`` for the cells whose center lie within the
+        specified sphere
 
     """
 
@@ -233,34 +310,24 @@ def get_indices_sphere(center, radius, cell_centers):
     dimMesh = np.size(cell_centers[0, :])
     assert len(center) == dimMesh, "Dimension mismatch. len(p0) != dimMesh"
 
-    if dimMesh == 1:
-        # Define the reference points
-
-        ind = np.abs(center[0] - cell_centers[:, 0]) < radius
+    if radius <= 0:
+        # no distance is below a non-positive radius, the squared comparison
+        # below would accept every cell within |radius|
+        return np.zeros(cell_centers.shape[0], dtype=bool)
 
-    elif dimMesh == 2:
-        # Define the reference points
-
-        ind = (
-            np.sqrt(
-                (center[0] - cell_centers[:, 0]) ** 2
-                + (center[1] - cell_centers[:, 1]) ** 2
-            )
-            < radius
+    center = np.asarray(center, dtype=float)
+    if numba is not None:
+        points_in_sphere = _choose_kernel(
+            _points_in_sphere_serial, _points_in_sphere_parallel, len(cell_centers)
         )
-
-    elif dimMesh == 3:
-        # Define the points
-        ind = (
-            np.sqrt(
-                (center[0] - cell_centers[:, 0]) ** 2
-                + (center[1] - cell_centers[:, 1]) ** 2
-                + (center[2] - cell_centers[:, 2]) ** 2
-            )
-            < radius
+        ind = points_in_sphere(
+            np.ascontiguousarray(cell_centers, dtype=float), center, float(radius)
         )
+    else:
+        # compare squared distances, no square root needed
+        diff = cell_centers - center
+        ind = np.einsum("ij,ij->i", diff, diff) < radius**2
 
-    # Return a tuple
     return ind
 
 
@@ -351,14 +418,8 @@ def create_from_function(cell_centers, fun_handle):
     if isinstance(cell_centers, BaseMesh):
         cell_centers = cell_centers.cell_centers
 
-    dim = np.size(cell_centers[0, :])
-    CC = [cell_centers[:, 0]]
-    if dim > 1:
-        CC.append(cell_centers[:, 1])
-    if dim > 2:
-        CC.append(cell_centers[:, 2])
-
-    sigma = fun_handle(*CC)
+    # pass each coordinate as a column view of the cell centers
+    sigma = fun_handle(*cell_centers.T)
 
     return mkvc(sigma)
 
@@ -385,21 +446,9 @@ def create_layers_model(cell_centers, layer_tops, layer_values):
     if isinstance(cell_centers, BaseMesh):
         cell_centers = cell_centers.cell_centers
 
-    descending = np.linalg.norm(sorted(layer_tops, reverse=True) - layer_tops) < 1e-20
-
-    # TODO: put an error check to make sure that there is an ordering... needs to work with inf elts
-    # assert ascending or descending, "Layers must be listed in either ascending or descending order"
-
-    # start from bottom up
-    if not descending:
-        zprop = np.hstack([mkvc(layer_tops, 2), mkvc(layer_values, 2)])
-        zprop.sort(axis=0)
-        layer_tops, layer_values = zprop[::-1, 0], zprop[::-1, 1]
-
     # put in vector form
     layer_tops, layer_values = mkvc(layer_tops), mkvc(layer_values)
 
-    # initialize with bottom layer
     dim = cell_centers.shape[1]
     if dim == 3:
         z = cell_centers[:, 2]
@@ -408,11 +457,11 @@ def create_layers_model(cell_centers, layer_tops, layer_values):
     elif dim == 1:
         z = cell_centers[:, 0]
 
-    model = np.zeros(cell_centers.shape[0])
-
-    for i, top in enumerate(layer_tops):
-        zind = z <= top
-        model[zind] = layer_values[i]
+    # each cell takes the value of the lowest layer top at or above it, cells
+    # above every layer top are set to zero
+    order = np.argsort(layer_tops)
+    values = np.r_[layer_values[order], 0.0]
+    model = values[np.searchsorted(layer_tops[order], z, side="left")]
 
     return model
 
@@ -423,6 +472,7 @@ def create_random_model(
     anisotropy=None,
     its=100,
     bounds=None,
+    use_gaussian_filter=False,
     **kwargs,
 ):
     """
@@ -443,6 +493,11 @@ def create_random_model(
         Number of smoothing iterations after convolutions
     bounds : list of float
         Lower and upper bound for the model values
+    use_gaussian_filter : bool, optional
+        If ``True``, replace the ``its`` convolutions with a single Gaussian
+        filter whose variance along each axis matches that of the iterated
+        kernel. This is much faster for large models and many iterations, but
+        only approximates the iterated convolution.
     seed : None or :class:`~simpeg.typing.RandomSeed`, optional
 
         .. deprecated:: 0.23.0
@@ -501,18 +556,26 @@ def create_random_model(
         elif len(shape) == 2:
             smth = np.array([[1, 7, 1], [2, 10, 2], [1, 7, 1]], dtype=float)
         elif len(shape) == 3:
-            kernal = np.array([1, 4, 1], dtype=float).reshape((1, 3))
-            smth = np.array(
-                sp.kron(sp.kron(kernal, kernal.T).todense()[:], kernal).todense()
-            ).reshape((3, 3, 3))
+            kernel = np.array([1, 4, 1], dtype=float)
+            smth = np.einsum("i,j,k->ijk", kernel, kernel, kernel)
     else:
         assert len(anisotropy.shape) is len(shape), "Anisotropy must be the same shape."
         smth = np.array(anisotropy, dtype=float)
 
     smth = smth / smth.sum()  # normalize
-    mi = mr
-    for _ in range(its):
-        mi = ndi.convolve(mi, smth)
+    if use_gaussian_filter:
+        # the iterated kernel tends to a Gaussian with its summed variances
+        mi = ndi.gaussian_filter(mr, sigma=_kernel_sigma(smth, its), mode="reflect")
+    else:
+        factors = _separable_factors(smth) if smth.ndim > 1 else None
+        mi = mr
+        for _ in range(its):
+            if factors is None:
+                mi = ndi.convolve(mi, smth)
+            else:
+                # same as the full kernel, one 1D pass per axis
+                for axis, factor in enumerate(factors):
+                    mi = ndi.convolve1d(mi, factor, axis=axis)
 
     # scale the model to live between the bounds.
     mi = (mi - mi.min()) / (mi.max() - mi.min())  # scaled between 0 and 1
@@ -521,6 +584,34 @@ def create_random_model(
     return mi
 
 
+def _kernel_sigma(kernel, its):
+    """Standard deviation along each axis of a kernel convolved ``its`` times."""
+    sigma = []
+    for i in range(kernel.ndim):
+        marginal = kernel.sum(axis=tuple(j for j in range(kernel.ndim) if j != i))
+        offsets = np.arange(marginal.size) - (marginal.size - 1) / 2
+        mean = np.sum(offsets * marginal)
+        sigma.append(np.sqrt(its * np.sum((offsets - mean) ** 2 * marginal)))
+    return sigma
+
+
+def _separable_factors(kernel):
+    """Split a normalized kernel into 1D factors along each axis.
+
+    Returns ``None`` if the kernel is not the outer product of its factors.
+    """
+    factors = [
+        kernel.sum(axis=tuple(j for j in range(kernel.ndim) if j != i))
+        for i in range(kernel.ndim)
+    ]
+    outer = factors[0]
+    for factor in factors[1:]:
+        outer = np.multiply.outer(outer, factor)
+    if not np.allclose(outer, kernel, rtol=1e-12, atol=0):
+        return None
+    return factors
+
+
 def get_indices_polygon(mesh, pts):
     """Get indices for cells whose centers lie within the convex hull of a set of points.
 
@@ -543,6 +634,10 @@ def get_indices_polygon(mesh, pts):
         assert ~(pts.shape[1] != 2), "Please input (*,2) array"
     elif mesh.dim == 3:
         assert ~(pts.shape[1] != 3), "Please input (*,3) array"
-    hull = Delaunay(pts)
+    pts = np.asarray(pts, dtype=float)
+    if pts.shape[0] <= _MAX_CACHED_HULL_POINTS:
+        hull = _cached_delaunay(pts.tobytes(), pts.shape)
+    else:
+        hull = Delaunay(pts)
     inds = hull.find_simplex(mesh.cell_centers) >= 0
     return inds
@@ -292,14 +292,14 @@ class DCProblemAnalyticTests_DPField(unittest.TestCase):
         ROI_large_TSE = np.array([200, 0])
         ROI_largeInds = utils.model_builder.get_indices_block(
             ROI_large_BNW, ROI_large_TSE, mesh.gridN
-        )[0]
+        )
         # print(ROI_largeInds.shape)
 
         ROI_small_BNW = np.array([-50, -25])
         ROI_small_TSE = np.array([50, 0])
         ROI_smallInds = utils.model_builder.get_indices_block(
             ROI_small_BNW, ROI_small_TSE, mesh.gridN
-        )[0]
+        )
         # print(ROI_smallInds.shape)
 
         ROI_inds = np.setdiff1d(ROI_largeInds, ROI_smallInds)
@@ -74,14 +74,14 @@ class DC_CC_DipoleFullspaceTests(unittest.TestCase):
         ROI_large_TSE = np.array([75, -75, 75])
         ROI_largeInds = utils.model_builder.get_indices_block(
             ROI_large_BNW, ROI_large_TSE, faceGrid
-        )[0]
+        )
         # print(ROI_largeInds.shape)
 
         ROI_small_BNW = np.array([-4, 4, -4])
         ROI_small_TSE = np.array([4, -4, 4])
         ROI_smallInds = utils.model_builder.get_indices_block(
             ROI_small_BNW, ROI_small_TSE, faceGrid
-        )[0]
+        )
         # print(ROI_smallInds.shape)
 
         ROIfaceInds = np.setdiff1d(ROI_largeInds, ROI_smallInds)
@@ -244,14 +244,14 @@ class DC_N_DipoleFullspaceTests(unittest.TestCase):
         ROI_large_TSE = np.array([75, -75, 75])
         ROI_largeInds = utils.model_builder.get_indices_block(
             ROI_large_BNW, ROI_large_TSE, edgeGrid
-        )[0]
+        )
         # print(ROI_largeInds.shape)
 
         ROI_small_BNW = np.array([-4, 4, -4])
         ROI_small_TSE = np.array([4, -4, 4])
         ROI_smallInds = utils.model_builder.get_indices_block(
             ROI_small_BNW, ROI_small_TSE, edgeGrid
-        )[0]
+        )
         # print(ROI_smallInds.shape)
 
         ROIedgeInds = np.setdiff1d(ROI_largeInds, ROI_smallInds)
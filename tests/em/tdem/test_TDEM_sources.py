@@ -1,22 +1,36 @@
+import gc
+import pickle
+import pymatsolver
 import pytest
 import unittest
 
+import discretize
 import numpy as np
 import scipy.sparse as sp
 from discretize.tests import check_derivative
 from numpy.testing import assert_array_almost_equal
+from simpeg.electromagnetics.time_domain import (
+    Simulation3DCurrentDensity,
+    Simulation3DElectricField,
+    Survey,
+)
 from simpeg.electromagnetics.time_domain.sources import (
     CircularLoop,
     ExponentialWaveform,
     HalfSineWaveform,
+    LineCurrent,
+    MagDipole,
     PiecewiseLinearWaveform,
     QuarterSineRampOnWaveform,
     RampOffWaveform,
+    RawVec_Grounded,
+    RawWaveform,
     StepOffWaveform,
     TrapezoidWaveform,
     TriangularWaveform,
     VTEMWaveform,
 )
+from simpeg.utils import Zero
 
 
 class TestStepOffWaveform(unittest.TestCase):
@@ -97,6 +111,25 @@ class TestVTEMWaveform(unittest.TestCase):
         )
         assert_array_almost_equal(result, expected)
 
+    def test_waveform_updated_param(self):
+        vtem = VTEMWaveform()
+        vtem.off_time = 8e-3
+        vtem.peak_time = 4e-3
+        vtem.ramp_on_rate = 2.0
+        result = [vtem.eval(t) for t in self.times]
+        expected = np.array(
+            [0.0, 0.455054, 0.731059, 0.898464, 1.0, 0.75, 0.5, 0.25, 0.0, 0.0, 0.0]
+        )
+        assert_array_almost_equal(result, expected)
+
+    def test_waveform_stores_assigned_param(self):
+        vtem = VTEMWaveform(peak_time=1e-3)
+        assert vtem.peak_time == 1e-3
+        vtem.off_time = 6e-3
+        vtem.peak_time = 2e-3
+        assert vtem.off_time == 6e-3
+        assert vtem.peak_time == 2e-3
+
     def test_waveform_derivative(self):
         # Test the waveform derivative at points between the time_nodes
         wave = VTEMWaveform(off_time=8e-3, peak_time=4e-3, ramp_on_rate=2.0)
@@ -139,6 +172,17 @@ class TestTrapezoidWaveform(unittest.TestCase):
         expected = np.array([0.0, 0.5, 1.0, 1.0, 1.0, 1.0, 1.0, 0.75, 0.5, 0.25, 0.0])
         assert_array_almost_equal(result, expected)
 
+    def test_waveform_updated_ramps(self):
+        trapezoid = TrapezoidWaveform(
+            ramp_on=np.r_[0.0, 2e-3], ramp_off=np.r_[6e-3, 8e-3]
+        )
+        trapezoid.ramp_on = np.r_[0.0, 4e-3]
+        trapezoid.ramp_off = np.r_[6e-3, 10e-3]
+        result = [trapezoid.eval(t) for t in self.times]
+        expected = np.array([0.0, 0.25, 0.5, 0.75, 1.0, 1.0, 1.0, 0.75, 0.5, 0.25, 0.0])
+        assert_array_almost_equal(result, expected)
+        assert_array_almost_equal(trapezoid.eval(self.times), expected)
+
     def test_waveform_derivative(self):
         # Test the waveform derivative at points between the time_nodes
         wave = TrapezoidWaveform(ramp_on=np.r_[0.0, 2e-3], ramp_off=np.r_[6e-3, 10e-3])
@@ -171,6 +215,13 @@ class TestTriangularWaveform(unittest.TestCase):
         expected = np.array([0.0, 0.25, 0.5, 0.75, 1.0, 0.75, 0.5, 0.25, 0.0, 0.0, 0.0])
         assert_array_almost_equal(result, expected)
 
+    def test_waveform_updated_peak_time(self):
+        triangular = TriangularWaveform(start_time=0, peak_time=2e-3, off_time=8e-3)
+        triangular.peak_time = 4e-3
+        result = [triangular.eval(t) for t in self.times]
+        expected = np.array([0.0, 0.25, 0.5, 0.75, 1.0, 0.75, 0.5, 0.25, 0.0, 0.0, 0.0])
+        assert_array_almost_equal(result, expected)
+
     def test_waveform_with_asymmetric_on_off(self):
         triangular = TriangularWaveform(start_time=0, peak_time=2e-3, off_time=6e-3)
         result = [triangular.eval(t) for t in self.times]
@@ -542,3 +593,187 @@ def test_removal_circular_loop_n():
             current=0.5,
             N=2,
         )
+
+
+@pytest.mark.parametrize(
+    "waveform",
+    [
+        StepOffWaveform(off_time=1e-3),
+        RampOffWaveform(off_time=5e-3),
+        VTEMWaveform(off_time=8e-3, peak_time=4e-3, ramp_on_rate=2.0),
+        TrapezoidWaveform(ramp_on=np.r_[0.0, 2e-3], ramp_off=np.r_[6e-3, 8e-3]),
+        QuarterSineRampOnWaveform(ramp_on=np.r_[0.0, 8e-3], ramp_off=np.r_[2e-3, 1e-2]),
+        HalfSineWaveform(ramp_on=np.r_[0.0, 3e-3], ramp_off=np.r_[7e-3, 1e-2]),
+        PiecewiseLinearWaveform(
+            times=np.r_[0.0, 2e-3, 5e-3, 9e-3], currents=np.r_[0.0, 1.0, 0.6, 0.0]
+        ),
+        ExponentialWaveform(
+            start_time=0.0, peak_time=4e-3, ramp_on_tau=1e-3, off_time=9e-3
+        ),
+        RawWaveform(waveform_function=lambda t: np.sin(1e3 * t)),
+    ],
+)
+def test_vectorized_eval(waveform):
+    """Evaluating an array of times matches evaluating each time individually."""
+    times = np.linspace(-1e-3, 1.1e-2, 131)
+    result = waveform.eval(times)
+    assert isinstance(result, np.ndarray)
+    assert result.shape == times.shape
+    expected = np.array([waveform.eval(t) for t in times])
+    np.testing.assert_allclose(result, expected)
+    assert isinstance(waveform.eval(times[10]), float)
+    assert isinstance(waveform.eval(np.array(times[10])), float)
+
+
+@pytest.mark.parametrize(
+    "simulation_class", [Simulation3DElectricField, Simulation3DCurrentDensity]
+)
+def test_s_e_zero_when_waveform_off(simulation_class):
+    """Sources return Zero once the waveform has switched off."""
+    mesh = discretize.TensorMesh([4, 4, 4], origin="CCC")
+    waveform = RampOffWaveform(off_time=1e-5)
+    sources = [MagDipole([], waveform=waveform)]
+    if simulation_class is Simulation3DCurrentDensity:
+        sources.append(
+            LineCurrent(
+                [],
+                waveform=waveform,
+                location=np.array([[-1.2, 0.3, 0.1], [1.3, 0.3, 0.1]]),
+            )
+        )
+    sim = simulation_class(
+        mesh, survey=Survey(sources), sigma=1.0, time_steps=[(1e-6, 20)]
+    )
+    for src in sources:
+        assert isinstance(src.s_e(sim, 2e-5), Zero)
+        assert not isinstance(src.s_e(sim, 5e-6), Zero)
+
+
+@pytest.mark.parametrize(
+    "simulation_class", [Simulation3DElectricField, Simulation3DCurrentDensity]
+)
+@pytest.mark.parametrize(
+    "waveform",
+    [
+        StepOffWaveform(),
+        VTEMWaveform(off_time=1e-5, peak_time=5e-6),
+        PiecewiseLinearWaveform(
+            times=np.r_[0.0, 4e-6, 1.2e-5], currents=np.r_[1.0, 0.7, 0.0]
+        ),
+        ExponentialWaveform(
+            start_time=0.0, peak_time=5e-6, ramp_on_tau=2e-6, off_time=1e-5
+        ),
+        RawWaveform(waveform_function=lambda t: np.cos(1e5 * t)),
+    ],
+)
+def test_s_e_batch(simulation_class, waveform):
+    """Batched source terms match s_e evaluated at each time."""
+    mesh = discretize.TensorMesh([4, 4, 4], origin="CCC")
+    src = MagDipole([], waveform=waveform)
+    sim = simulation_class(
+        mesh, survey=Survey([src]), sigma=1.0, time_steps=[(1e-6, 20)]
+    )
+    s_e = src.s_e_batch(sim, sim.times)
+    assert s_e.shape == (len(src._s_eSrc(sim)), len(sim.times))
+    for i, time in enumerate(sim.times):
+        expected = src.s_e(sim, time)
+        if isinstance(expected, Zero):
+            expected = np.zeros(s_e.shape[0])
+        np.testing.assert_allclose(s_e[:, i], expected)
+
+
+@pytest.mark.parametrize("source_class", [MagDipole, CircularLoop])
+def test_source_parameters_update_vector_potential(source_class):
+    """Setting a parameter rebuilds the cached analytic source."""
+    obs = np.array([[2.0, 1.0, 0.5]])
+    src = source_class([], location=np.r_[0.0, 0.0, 0.0])
+    src._srcFct(obs)
+    src.location = np.r_[1.0, 0.0, 0.0]
+    expected = source_class([], location=np.r_[1.0, 0.0, 0.0])._srcFct(obs)
+    np.testing.assert_allclose(src._srcFct(obs), expected)
+
+
+def test_source_cache_follows_simulation():
+    """A source reused across simulations never hands out stale vectors."""
+    src = MagDipole([], location=np.r_[0.0, 0.0, 0.0])
+    for n in [4, 6, 4, 6]:
+        mesh = discretize.TensorMesh([n, n, n], origin="CCC")
+        sim = Simulation3DElectricField(
+            mesh, survey=Survey([src]), sigma=1.0, time_steps=[(1e-6, 20)]
+        )
+        assert src.s_e(sim, 0.0).shape == (mesh.n_edges,)
+        b = src.bInitial(sim)
+        b[:] = 0.0
+        assert np.any(src.bInitial(sim) != 0.0)
+        del sim
+    gc.collect()
+    assert len(src._cache) == 0
+
+
+def test_cached_factorization_cleaned_with_simulation():
+    """Factorizations held by a source are cleaned when the simulation goes."""
+    cleaned = []
+
+    class CountingSolver(pymatsolver.Solver):
+        def clean(self):
+            cleaned.append(self)
+            super().clean()
+
+    src = MagDipole([], location=np.r_[0.0, 0.0, 0.0])
+    for n in [4, 6]:
+        mesh = discretize.TensorMesh([n, n, n], origin="CCC")
+        sim = Simulation3DElectricField(
+            mesh,
+            survey=Survey([src]),
+            sigma=1.0,
+            time_steps=[(1e-6, 20)],
+            solver=CountingSolver,
+        )
+        Ainv = src._getAmagnetostaticinv(sim)
+        assert src._getAmagnetostaticinv(sim) is Ainv
+        del sim
+        gc.collect()
+    assert len(cleaned) == 2
+    assert len(src._solver_cache) == 0
+
+
+def test_raw_vec_grounded_keeps_s_e_on_location_change():
+    """Moving a RawVec_Grounded source keeps the user supplied source term."""
+    mesh = discretize.TensorMesh([4, 4, 4], origin="CCC")
+    s_e = np.linspace(0.0, 1.0, mesh.n_faces)
+    src = RawVec_Grounded(
+        [], s_e=s_e, location=np.array([[-1.2, 0.3, 0.1], [1.3, 0.3, 0.1]])
+    )
+    sim = Simulation3DCurrentDensity(
+        mesh, survey=Survey([src]), sigma=1.0, time_steps=[(1e-6, 20)]
+    )
+    np.testing.assert_allclose(src.s_e(sim, 0.0), s_e)
+    src.location = np.array([[-1.0, -0.3, 0.1], [1.0, -0.3, 0.1]])
+    np.testing.assert_allclose(src.s_e(sim, 0.0), s_e)
+
+
+@pytest.mark.parametrize("source_class", [MagDipole, CircularLoop, LineCurrent])
+@pytest.mark.parametrize("fill_cache", [False, True])
+def test_source_pickles(source_class, fill_cache):
+    """Sources survive a pickle round trip, with or without cached operators."""
+    if source_class is LineCurrent:
+        src = LineCurrent([], location=np.array([[-1.2, 0.3, 0.1], [1.3, 0.3, 0.1]]))
+        simulation_class = Simulation3DCurrentDensity
+    else:
+        src = source_class([], location=np.r_[0.0, 0.0, 0.0])
+        simulation_class = Simulation3DElectricField
+    mesh = discretize.TensorMesh([4, 4, 4], origin="CCC")
+    sim = simulation_class(
+        mesh, survey=Survey([src]), sigma=1.0, time_steps=[(1e-6, 20)]
+    )
+    if fill_cache:
+        src.s_e(sim, 0.0)
+        if source_class is LineCurrent:
+            src._getAmmrinv(sim)
+        else:
+            src._getAmagnetostaticinv(sim)
+    new_sim = pickle.loads(pickle.dumps(sim))
+    new_src = new_sim.survey.source_list[0]
+    assert len(new_src._cache) == 0
+    assert len(new_src._solver_cache) == 0
+    np.testing.assert_allclose(new_src.s_e(new_sim, 0.0), src.s_e(sim, 0.0))
@@ -80,7 +80,7 @@ class MVIProblemTest(unittest.TestCase):
             np.r_[-20, -20, -10],
             np.r_[20, 20, 25],
             mesh.gridCC,
-        )[0]
+        )
 
         # Assign magnetization values
         model[ind, :] = np.kron(np.ones((ind.shape[0], 1)), M_xyz * 0.05)
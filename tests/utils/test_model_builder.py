@@ -4,7 +4,19 @@ Test functions in model_builder.
 
 import pytest
 import numpy as np
-from simpeg.utils.model_builder import create_random_model
+import scipy.ndimage as ndi
+import discretize
+from simpeg.utils import _numba_functions, model_builder
+from simpeg.utils.model_builder import (
+    add_block,
+    create_blocks_in_wholespace,
+    create_ellipse_in_wholespace,
+    create_layers_model,
+    create_random_model,
+    get_indices_block,
+    get_indices_polygon,
+    get_indices_sphere,
+)
 
 
 class TestDeprecateSeedProperty:
@@ -58,3 +70,157 @@ class TestDeprecateSeedProperty:
         with pytest.raises(TypeError, match=msg):
             with pytest.warns(FutureWarning):
                 create_random_model(shape, seed=10, **kwargs)
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+@pytest.mark.parametrize("dim", [1, 2, 3])
+def test_get_indices_block(dim, use_numba, monkeypatch):
+    """
+    Test that the block contains the cells whose centers are inside it.
+    """
+    if not use_numba:
+        monkeypatch.setattr(model_builder, "numba", None)
+    rng = np.random.default_rng(seed=5143)
+    cell_centers = rng.uniform(-1, 1, size=(500, dim))
+    # corners given in the wrong order on purpose
+    p0 = np.full(dim, 0.5)
+    p1 = np.full(dim, -0.25)
+    ind = get_indices_block(p0, p1, cell_centers)
+    inside = np.all((cell_centers >= -0.25) & (cell_centers <= 0.5), axis=1)
+    np.testing.assert_equal(ind, np.flatnonzero(inside))
+    # the corners passed in are left untouched
+    np.testing.assert_equal(p0, 0.5)
+    np.testing.assert_equal(p1, -0.25)
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+@pytest.mark.parametrize("dim", [1, 2, 3])
+def test_get_indices_sphere(dim, use_numba, monkeypatch):
+    """
+    Test that the sphere contains the cells whose centers are inside it.
+    """
+    if not use_numba:
+        monkeypatch.setattr(model_builder, "numba", None)
+    rng = np.random.default_rng(seed=7263)
+    cell_centers = rng.uniform(-1, 1, size=(500, dim))
+    center = np.full(dim, 0.1)
+    ind = get_indices_sphere(center, 0.6, cell_centers)
+    distance = np.linalg.norm(cell_centers - center, axis=1)
+    np.testing.assert_equal(ind, distance < 0.6)
+    # like the distance comparison, a negative radius selects no cells
+    ind = get_indices_sphere(center, -0.6, cell_centers)
+    np.testing.assert_equal(ind, np.zeros(len(cell_centers), dtype=bool))
+
+
+@pytest.mark.skipif(model_builder.numba is None, reason="requires numba")
+@pytest.mark.parametrize("parallel", [True, False])
+def test_kernel_choice(parallel, monkeypatch):
+    """
+    Test that the serial and parallel kernels select the same cells.
+    """
+    min_points = 0 if parallel else np.inf
+    monkeypatch.setattr(_numba_functions, "_PARALLEL_MIN_POINTS", min_points)
+    rng = np.random.default_rng(seed=2291)
+    cell_centers = rng.uniform(-1, 1, size=(500, 3))
+    ind = get_indices_block([-0.25, -0.25, -0.25], [0.5, 0.5, 0.5], cell_centers)
+    inside = np.all((cell_centers >= -0.25) & (cell_centers <= 0.5), axis=1)
+    np.testing.assert_equal(ind, np.flatnonzero(inside))
+    ind = get_indices_sphere([0.1, 0.1, 0.1], 0.6, cell_centers)
+    np.testing.assert_equal(ind, np.linalg.norm(cell_centers - 0.1, axis=1) < 0.6)
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_create_layers_model(descending):
+    """
+    Test that each cell takes the value of the layer it lies in.
+    """
+    z = np.array([12.0, 10.0, 6.0, 0.0, -0.5, -40.0])
+    cell_centers = np.c_[np.zeros_like(z), np.zeros_like(z), z]
+    layer_tops = np.array([10.0, 5.0, 0.0])
+    layer_values = np.array([3.0, 1.0, 2.0])
+    if not descending:
+        layer_tops, layer_values = layer_tops[::-1], layer_values[::-1]
+    model = create_layers_model(cell_centers, layer_tops, layer_values)
+    np.testing.assert_equal(model, [0.0, 3.0, 3.0, 2.0, 2.0, 2.0])
+
+
+def test_create_random_model_separable_kernel():
+    """
+    Test the separable smoothing against the full 3D kernel convolution.
+    """
+    shape = (8, 7, 6)
+    its = 5
+    model = create_random_model(shape, random_seed=523, its=its)
+
+    kernel = np.array([1, 4, 1], dtype=float)
+    smth = np.einsum("i,j,k->ijk", kernel, kernel, kernel)
+    smth /= smth.sum()
+    expected = np.random.default_rng(seed=523).random(size=shape)
+    for _ in range(its):
+        expected = ndi.convolve(expected, smth)
+    expected = (expected - expected.min()) / (expected.max() - expected.min())
+    np.testing.assert_allclose(model, expected, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("shape", [(200,), (40, 30), (20, 15, 10)])
+def test_create_random_model_gaussian_filter(shape):
+    """
+    Test that the Gaussian filter approximates the iterated convolutions.
+    """
+    model = create_random_model(shape, random_seed=8761)
+    approximate = create_random_model(shape, random_seed=8761, use_gaussian_filter=True)
+    np.testing.assert_allclose(approximate, model, atol=1e-2)
+
+
+def test_create_ellipse_in_wholespace():
+    """
+    Test the model at the center and on the boundary of a rotated ellipse.
+    """
+    center = np.array([1.0, -2.0, 0.5])
+    theta = 30.0
+    # unit vectors along the axes of the ellipse, rotated by theta
+    angle = np.deg2rad(theta)
+    u = np.array([np.cos(angle), np.sin(angle), 0.0])
+    w = np.array([0.0, 0.0, 1.0])
+    cell_centers = np.vstack([center, center + 2.0 * u, center + 1.5 * w])
+    model = create_ellipse_in_wholespace(
+        cell_centers, center=center, anisotropy=[4.0, 1.0, 3.0], theta=theta
+    )
+    np.testing.assert_allclose(model, [0.5 + np.arctan(10) / np.pi, 0.5, 0.5])
+
+
+def test_get_indices_polygon_reused_points():
+    """
+    Test that editing the hull points in place changes the selected cells.
+    """
+    mesh = discretize.TensorMesh([10, 10])
+    pts = np.array([[0.0, 0.0], [0.5, 0.0], [0.5, 0.5], [0.0, 0.5]])
+    inds = get_indices_polygon(mesh, pts)
+    np.testing.assert_equal(inds, np.all(mesh.cell_centers <= 0.5, axis=1))
+
+    pts[1:3, 0] = 1.0
+    inds = get_indices_polygon(mesh, pts)
+    np.testing.assert_equal(inds, mesh.cell_centers[:, 1] <= 0.5)
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_create_blocks_in_wholespace(use_numba, monkeypatch):
+    """
+    Test that stacking blocks at once matches adding them one by one.
+    """
+    if not use_numba:
+        monkeypatch.setattr(model_builder, "numba", None)
+    rng = np.random.default_rng(seed=3481)
+    cell_centers = rng.uniform(-1, 1, size=(2000, 3))
+    p0s = rng.uniform(-1, 0.5, size=(6, 3))
+    p1s = p0s + rng.uniform(0.2, 1.0, size=(6, 3))
+    values = np.arange(1.0, 7.0)
+
+    expected = np.full(cell_centers.shape[0], -1.0)
+    for p0, p1, value in zip(p0s, p1s, values):
+        expected = add_block(cell_centers, expected, p0, p1, value)
+
+    model = create_blocks_in_wholespace(
+        cell_centers, p0s, p1s, values, background_value=-1.0
+    )
+    np.testing.assert_equal(model, expected)